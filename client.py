@@ -1,4 +1,5 @@
 import sys, requests, os
+from requests.adapters import HTTPAdapter
 
 api_url = sys.argv[1] if len(sys.argv) > 1 else "https://turnover-report-vbs.azurewebsites.net/report"
 json_path = sys.argv[2] if len(sys.argv) > 2 else "turnover.json"
@@ -8,21 +9,30 @@ if not os.path.exists(json_path):
     print(f"JSON not found: {json_path}", file=sys.stderr)
     sys.exit(1)
 
+# Keep-alive session: repeated calls reuse the pooled TCP/TLS connection
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
 with open(json_path, "rb") as f:
     files = {"file": ("turnover.json", f, "application/json")}
-    r = requests.post(api_url, files=files)
+    r = session.post(api_url, files=files, stream=True)
 
-if not r.ok:
-    print(f"HTTP {r.status_code}: {r.text}", file=sys.stderr)
-    sys.exit(2)
+with r:
+    if not r.ok:
+        print(f"HTTP {r.status_code}: {r.text}", file=sys.stderr)
+        sys.exit(2)
 
-# Prefer filename from response if provided
-cd = r.headers.get("Content-Disposition", "")
-fname = out_path
-if "filename=" in cd:
-    fname = cd.split("filename=",1)[1].strip().strip('"')
+    # Prefer filename from response if provided
+    cd = r.headers.get("Content-Disposition", "")
+    fname = out_path
+    if "filename=" in cd:
+        fname = cd.split("filename=",1)[1].strip().strip('"')
 
-with open(fname, "wb") as out:
-    out.write(r.content)
+    # Stream the workbook to disk instead of holding it all in memory
+    with open(fname, "wb") as out:
+        for chunk in r.iter_content(chunk_size=1 << 16):
+            out.write(chunk)
 
 print(f"✅ Saved: {os.path.abspath(fname)}")
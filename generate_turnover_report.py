@@ -1,16 +1,29 @@
-import json
+import orjson
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
 
 # ---------- CONFIG ----------
 JSON_FILE = "turnover.json"
 OUTPUT_XLSX = "turnover-output.xlsx"
 
+# ---------- STYLES ----------
+# Built once and shared by every cell that uses them
+BANNER_FILL = PatternFill("solid", fgColor="FFFFFF00")   # yellow fill
+BOLD_FONT = Font(bold=True)
+CAPTION_FONT = Font(size=14, bold=True)
+LEGEND_FONT = Font(italic=True)
+HEADER_FONT = Font(bold=True, color="FFFFFFFF")
+HEADER_FILL = PatternFill("solid", fgColor="FF4F81BD")   # blue fill
+LEFT_ALIGN = Alignment(horizontal="left")
+CENTER_ALIGN = Alignment(horizontal="center")
+STRIPE_FILL = PatternFill("solid", fgColor="FFDCE6F1")   # banded rows, light blue
+
 # ---------- LOAD JSON ----------
-with open(JSON_FILE, encoding="utf-8") as f:
-    data = json.load(f)
+# orjson parses the raw bytes directly (no separate UTF-8 decode)
+with open(JSON_FILE, "rb") as f:
+    data = orjson.loads(f.read())
 
 caption = data["caption"]  # "Turnover Report"
 date_time_user = data["dateTimeUser"]
@@ -19,84 +32,98 @@ columns = [c["caption"] for c in data["columns"]]  # Display headers
 rows = data["rows"]                                # List of row dicts
 
 # ---------- BUILD WORKBOOK ----------
-wb = Workbook()
-ws = wb.active
-ws.title = "Report"
+# Write-only mode streams each appended row straight to XML (via lxml)
+# instead of keeping a cell grid in memory
+wb = Workbook(write_only=True)
+ws = wb.create_sheet("Report")
+
+header_row = 5
+end_row = header_row + len(rows)
+end_col = len(columns)
+col_letters = [get_column_letter(i) for i in range(1, end_col+1)]
+keys = [c["name"] for c in data["columns"]]
+
+# Number formats for the EUR and % columns, applied as the cells are written
+number_formats = [None] * len(columns)
+number_formats[columns.index("Turnover\r\nEUR")] = "#,##0.00"
+number_formats[columns.index("%")] = "0.0%"
+
+# ---------- FORMAT COLUMNS ----------
+# Column widths are written ahead of the rows, so size them up front
+# from header + content
+max_len = [len(str(c)) for c in columns]
+for row in rows:
+    for i, key in enumerate(keys):
+        L = len(str(row.get(key, "")))
+        if L > max_len[i]:
+            max_len[i] = L
+
+for letter, w in zip(col_letters, max_len):
+    ws.column_dimensions[letter].width = w + 2
+
+# ---------- FILTER ----------
+# Filter arrows over header + data. The blue header and banded rows are
+# styled on the cells themselves, so no Excel table part is needed.
+ws.auto_filter.ref = f"A{header_row}:{col_letters[-1]}{end_row}"
 
 # ---------- HEADER AREA ----------
 # A1: DateTimeUser
-cell = ws["A1"]
-cell.value = date_time_user
-cell.fill = PatternFill("solid", fgColor="FFFF00")   # yellow fill
-cell.font = Font(bold=True)
-cell.alignment = Alignment(horizontal="left")
+cell = WriteOnlyCell(ws, value=date_time_user)
+cell.fill = BANNER_FILL
+cell.font = BOLD_FONT
+cell.alignment = LEFT_ALIGN
+ws.append([cell])
 
 # A2: Caption
-cell = ws["A2"]
-cell.value = caption
-cell.font = Font(size=14, bold=True)
-cell.alignment = Alignment(horizontal="left")
+cell = WriteOnlyCell(ws, value=caption)
+cell.font = CAPTION_FONT
+cell.alignment = LEFT_ALIGN
+ws.append([cell])
 
 # A3: Legend
-cell = ws["A3"]
-cell.value = legend
-cell.font = Font(italic=True)
-cell.alignment = Alignment(horizontal="left")
+cell = WriteOnlyCell(ws, value=legend)
+cell.font = LEGEND_FONT
+cell.alignment = LEFT_ALIGN
+ws.append([cell])
 
-# ---------- TABLE ----------
-header_row = 5
-# Write headers
-for col_idx, header in enumerate(columns, start=1):
-    c = ws.cell(row=header_row, column=col_idx, value=header)
-    c.font = Font(bold=True, color="FFFFFF")
-    c.fill = PatternFill("solid", fgColor="4F81BD")  # blue fill
-    c.alignment = Alignment(horizontal="center")
-
-# Write data rows
-for r, row in enumerate(rows, start=header_row+1):
-    for c, col_def in enumerate(data["columns"], start=1):
-        val = row.get(col_def["name"], "")
-        ws.cell(row=r, column=c).value = val
+ws.append([])  # row 4 stays empty
 
-# ---------- FORMAT COLUMNS ----------
-end_row = header_row + len(rows)
-end_col = len(columns)
-
-# Adjust column widths based on header + content
-for idx, col_def in enumerate(data["columns"], start=1):
-    col_caption = col_def["caption"]
-    col_key = col_def["name"]
-
-    max_len = max(
-        len(str(col_caption)),
-        max((len(str(r.get(col_key, ""))) for r in rows), default=0)
-    )
-    ws.column_dimensions[get_column_letter(idx)].width = max_len + 2
-
-# EUR column formatting
-eur_col = columns.index("Turnover\r\nEUR") + 1
-for r in range(header_row+1, end_row+1):
-    ws.cell(row=r, column=eur_col).number_format = "#,##0.00"
-
-# % column formatting
-pct_col = columns.index("%") + 1
-for r in range(header_row+1, end_row+1):
-    ws.cell(row=r, column=pct_col).number_format = "0.0%"
-
-# ---------- CREATE EXCEL TABLE ----------
-table_range = f"A{header_row}:{get_column_letter(end_col)}{end_row}"
-table = Table(displayName="TurnoverTable", ref=table_range)
-
-# Blue header + banded rows
-style = TableStyleInfo(
-    name="TableStyleMedium9",
-    showFirstColumn=False,
-    showLastColumn=False,
-    showRowStripes=True,
-    showColumnStripes=False
-)
-table.tableStyleInfo = style
-ws.add_table(table)
+# ---------- HEADER ROW + DATA ----------
+# Write headers
+header_cells = []
+for header in columns:
+    c = WriteOnlyCell(ws, value=header)
+    c.font = HEADER_FONT
+    c.fill = HEADER_FILL
+    c.alignment = CENTER_ALIGN
+    header_cells.append(c)
+ws.append(header_cells)
+
+# Write data rows one ws.append() per row. Styled cells are created once
+# and refilled per row; append() serialises them immediately. Every other
+# row, starting with the first, is banded, so it needs a cell per column.
+template_cells = []
+stripe_cells = []
+for i, fmt in enumerate(number_formats):
+    cell = WriteOnlyCell(ws)
+    cell.fill = STRIPE_FILL
+    if fmt:
+        cell.number_format = fmt
+        plain = WriteOnlyCell(ws)
+        plain.number_format = fmt
+        template_cells.append((i, plain))
+    stripe_cells.append(cell)
+for n, row in enumerate(rows):
+    vals = [row.get(key, "") for key in keys]
+    if n % 2 == 0:
+        for i, cell in enumerate(stripe_cells):
+            cell.value = vals[i]
+            vals[i] = cell
+    else:
+        for i, cell in template_cells:
+            cell.value = vals[i]
+            vals[i] = cell
+    ws.append(vals)
 
 # ---------- SAVE ----------
 wb.save(OUTPUT_XLSX)
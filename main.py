@@ -1,39 +1,60 @@
 # main.py
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-
-import io, json, logging, time
-from typing import List, Dict, Any
-from openpyxl.drawing.image import Image as XLImage
-
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+
+import asyncio, io, logging, multiprocessing, shutil, tempfile, threading, time, zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from operator import itemgetter
+import ijson
+import orjson
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.drawing.image import Image as XLImage
+from openpyxl.writer.excel import ExcelWriter
 import os
 from pathlib import Path
 
-LOG = logging.getLogger("turnover-api")
+# ---------------- Logging ----------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+)
+logger = logging.getLogger("turnover-api")
 
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_LOGO_PATH = BASE_DIR / "logo.png"              # bundled file
 ENV_LOGO_PATH = os.getenv("LOGO_PATH")                 # e.g., /home/site/wwwroot/logo.png
 ENV_LOGO_URL  = os.getenv("LOGO_URL")                  # e.g., https://.../logo.png (SAS/Blob/CDN)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "50")) * 1024 * 1024
+STREAM_PARSE_MIN_BYTES = 1024 * 1024                   # larger uploads keep their rows on disk
+XLSX_COMPRESSLEVEL = int(os.getenv("XLSX_COMPRESSLEVEL", "1"))  # zlib level for the .xlsx zip
+REPORT_PROCESSES = int(os.getenv("REPORT_PROCESSES", "0"))  # >0: build reports in worker processes
 
-# If a URL is provided, fetch once into temp file
+# If a URL is provided, fetch once into temp file (see get_logo)
 _cached_logo_file = None
-if ENV_LOGO_URL:
+
+def download_logo_url() -> None:
+    global _cached_logo_file
     try:
-        import requests, tempfile
+        import requests
         resp = requests.get(ENV_LOGO_URL, timeout=10)
         resp.raise_for_status()
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
         tmp.write(resp.content); tmp.flush(); tmp.close()
         _cached_logo_file = Path(tmp.name)
-        LOG.info(f"Downloaded logo from URL to {_cached_logo_file}")
+        logger.info(f"Downloaded logo from URL to {_cached_logo_file}")
     except Exception as e:
-        LOG.warning(f"Failed to download logo from LOGO_URL: {e}")
+        logger.warning(f"Failed to download logo from LOGO_URL: {e}")
 
 def resolve_logo_path() -> Path | None:
     if _cached_logo_file and _cached_logo_file.exists():
@@ -44,12 +65,44 @@ def resolve_logo_path() -> Path | None:
         return DEFAULT_LOGO_PATH
     return None
 
-# ---------------- Logging ----------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-)
-logger = logging.getLogger("turnover-api")
+LOGO_SIZE = (278, 40)  # px, exact size ~ 2.9" x 0.42" at 96 DPI
+
+def load_logo_bytes(logo_path: Path | None) -> bytes | None:
+    """Return the logo as a PNG already scaled to LOGO_SIZE, so reports embed a small image."""
+    if not logo_path:
+        return None
+    try:
+        from PIL import Image as PILImage
+        with PILImage.open(logo_path) as im:
+            im = im.resize(LOGO_SIZE, PILImage.LANCZOS)
+            out = io.BytesIO()
+            im.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+    except Exception as e:
+        logger.warning(f"Failed to load logo {logo_path}: {e}")
+        return None
+
+# The logo is read once, on first use rather than at import: report worker
+# processes import this module too, and they get the server's copy through
+# the pool initializer instead of downloading and scaling their own.
+_logo: tuple[Path | None, bytes | None] | None = None
+_logo_lock = threading.Lock()
+
+def get_logo() -> tuple[Path | None, bytes | None]:
+    """Return (source path, scaled PNG bytes) of the report logo; either may be None."""
+    global _logo
+    with _logo_lock:
+        if _logo is None:
+            if ENV_LOGO_URL:
+                download_logo_url()
+            logo_path = resolve_logo_path()
+            _logo = (logo_path, load_logo_bytes(logo_path))
+        return _logo
+
+def _init_report_worker(logo: tuple[Path | None, bytes | None]) -> None:
+    """Report pool initializer: adopt the server process's logo."""
+    global _logo
+    _logo = logo
 
 # ---------------- App ----------------
 app = FastAPI(
@@ -70,6 +123,51 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Upload size guard: runs before the multipart parser spools the body, so an
+# oversized upload is refused without being read. A declared Content-Length
+# over the cap is answered straight away; a body without one (chunked) is
+# counted as it arrives and the upload fails with 413 once it crosses the cap.
+# This is plain ASGI because @app.middleware("http") can't wrap `receive`.
+class UploadSizeLimit:
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        cl = Headers(scope=scope).get("content-length", "")
+        if cl.isdigit() and int(cl) > self.max_bytes:
+            logger.warning(f"rejected upload path={path} content_length={cl}")
+            response = JSONResponse({"detail": "File too large."}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    logger.warning(f"rejected upload path={path} received>{self.max_bytes}")
+                    # FastAPI re-raises HTTPExceptions from body parsing as-is
+                    raise HTTPException(status_code=413, detail="File too large.")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(UploadSizeLimit, max_bytes=MAX_UPLOAD_BYTES)
+
+# Gzip for the JSON side (docs, openapi.json, error bodies over 1 KB). The
+# .xlsx is already a zip and is sent with Content-Encoding: identity, which
+# GZipMiddleware passes through untouched. Registered inside log_requests,
+# which re-streams bodies in chunks and would defeat the minimum size.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -96,8 +194,93 @@ app.add_middleware(
 )
 
 
+# ---------------- Payload loading ----------------
+HEADER_KEYS = ("caption", "dateTimeUser", "legend", "columns")
+_MISSING = object()
+
+
+class StreamedRows:
+    """
+    Re-iterable view of the top-level "rows" array of a JSON file. Each pass
+    re-parses the file with ijson, so only one row dict is alive at a time.
+    """
+
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self.fp.seek(0)
+        return ijson.items(self.fp, "rows.item", use_float=True)
+
+
+def load_payload(fp: BinaryIO) -> Dict[str, Any]:
+    """
+    Parse an uploaded report. Small files are parsed whole with orjson; for
+    larger ones only the header keys are read and payload["rows"] is a
+    StreamedRows over the file, so memory doesn't grow with the row count.
+    """
+    fp.seek(0, os.SEEK_END)
+    size = fp.tell()
+    fp.seek(0)
+    if size <= STREAM_PARSE_MIN_BYTES:
+        return orjson.loads(fp.read())
+
+    payload: Dict[str, Any] = {}
+    for key in HEADER_KEYS:
+        fp.seek(0)
+        value = next(ijson.items(fp, key, use_float=True), _MISSING)
+        if value is not _MISSING:
+            payload[key] = value
+    fp.seek(0)
+    events = ijson.parse(fp)
+    for prefix, event, value in events:
+        if prefix == "" and event == "map_key" and value == "rows":
+            _, event, _ = next(events)
+            # Anything but an array is left for build_workbook to reject,
+            # exactly as it rejects a small upload's non-list rows
+            payload["rows"] = StreamedRows(fp) if event == "start_array" else None
+            break
+    return payload
+
+
 # ---------------- Excel builder ----------------
-def build_workbook(payload: Dict[str, Any]) -> io.BytesIO:
+# Shared styles (built once, reused by every report)
+# Colors picked to match the screenshot closely
+BANNER_FILL = PatternFill("solid", fgColor="FFFFFF00")   # row 1 yellow banner
+BOLD_FONT = Font(bold=True)
+TITLE_FONT = Font(size=16, bold=True, color="FF1F4E78")  # blue title
+LEGEND_FONT = Font(italic=True)
+HEADER_FONT = Font(bold=True, color="FF000000")          # black header text
+HEADER_FILL = PatternFill("solid", fgColor="FFDDEBF7")   # light blue header band
+LEFT_ALIGN = Alignment(horizontal="left", vertical="center")
+CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+
+# Borders
+THIN_SIDE = Side(style="thin", color="FF9E9E9E")
+THICK_SIDE = Side(style="thick", color="FF000000")
+THIN_BORDER = Border(top=THIN_SIDE, left=THIN_SIDE, right=THIN_SIDE, bottom=THIN_SIDE)
+TOTAL_BORDER = Border(top=THICK_SIDE, left=THIN_SIDE, right=THIN_SIDE, bottom=THIN_SIDE)
+EUR_FMT = "#,##0.00"
+PCT_FMT = "0.0%"
+# Named styles carrying the number formats above (registered per workbook)
+EUR_STYLE = "turnover"
+PCT_STYLE = "pct"
+
+# Caption normalization: drops the line breaks of headers like "Turnover\r\nEUR"
+_CRLF_DELETE = str.maketrans("", "", "\r\n")
+
+
+def _to_float(val: Any, scale: float = 1.0) -> Any:
+    """Numeric cell value for `val` (divided by `scale`); blanks and non-numbers pass through."""
+    if val in (None, ""):
+        return val
+    try:
+        return float(val) / scale
+    except Exception:
+        return val
+
+
+def build_workbook(payload: Dict[str, Any], out: BinaryIO | None = None) -> BinaryIO:
     """
     Build an .xlsx that visually matches the screenshot:
       - merged yellow banner A1:D1
@@ -107,6 +290,14 @@ def build_workbook(payload: Dict[str, Any]) -> io.BytesIO:
       - currency & percent formats
       - totals row with thick top border
       - logo.png inserted around H2
+
+    The sheet is streamed row by row (write-only mode), so everything that
+    openpyxl writes ahead of the rows (widths, frozen panes) is set first:
+    payload["rows"] is read twice, once to size the columns and once to
+    write them, and may be any re-iterable (a list or StreamedRows).
+
+    The workbook is saved into `out` (a new BytesIO by default), which is
+    returned rewound.
     """
     # Validate minimal shape
     for key in ("caption", "dateTimeUser", "legend", "columns", "rows"):
@@ -123,7 +314,9 @@ def build_workbook(payload: Dict[str, Any]) -> io.BytesIO:
 
     # Columns / rows
     col_defs: List[Dict[str, str]] = payload["columns"]
-    rows: List[Dict[str, Any]] = payload["rows"]
+    rows: Iterable[Dict[str, Any]] = payload["rows"]
+    if not isinstance(rows, (list, StreamedRows)):
+        raise ValueError("'rows' must be an array")
 
     if not col_defs:
         raise ValueError("No columns provided.")
@@ -131,154 +324,171 @@ def build_workbook(payload: Dict[str, Any]) -> io.BytesIO:
     captions: List[str] = [c.get("caption", "") for c in col_defs]   # display headers
     keys: List[str] = [c.get("name", "") for c in col_defs]          # JSON keys
 
-    # Colors (picked to match the screenshot closely)
-    YELLOW_BANNER = "FFFF00"   # row 1
-    TITLE_BLUE = "1F4E78"      # title font color
-    HEADER_FILL = "DDEBF7"     # light blue header band
-    HEADER_FONT = "000000"     # black header text
-
-    # Borders
-    thin = Side(style="thin", color="9E9E9E")
-    thick = Side(style="thick", color="000000")
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Report"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Report")
+    # A NamedStyle binds to the workbook it is added to, so each report gets its own
+    wb.add_named_style(NamedStyle(name=EUR_STYLE, number_format=EUR_FMT))
+    wb.add_named_style(NamedStyle(name=PCT_STYLE, number_format=PCT_FMT))
 
     # Column count
     end_col = len(captions)
-    last_col_letter = get_column_letter(end_col)
+    col_letters = [get_column_letter(i) for i in range(1, end_col + 1)]
+    last_col_letter = col_letters[-1]
+
+    header_row = 5
+    start_row = header_row + 1
+
+    # Identify special columns from one normalized caption per column
+    percent_col_idx = None
+    turnover_col_idx = None
+    for idx, cap in enumerate(captions, start=1):
+        norm = cap.translate(_CRLF_DELETE).strip().lower()
+        if norm == "%":
+            percent_col_idx = idx
+        elif norm.startswith("turnover"):
+            turnover_col_idx = idx
+
+    # Per-column value transforms and named styles, resolved once for all rows
+    converters: List[Callable[[Any], Any] | None] = [None] * end_col
+    cell_styles: List[str | None] = [None] * end_col
+    if percent_col_idx is not None:
+        converters[percent_col_idx - 1] = partial(_to_float, scale=100.0)  # 6.4 -> 0.064
+        cell_styles[percent_col_idx - 1] = PCT_STYLE
+    if turnover_col_idx is not None:
+        converters[turnover_col_idx - 1] = _to_float
+        cell_styles[turnover_col_idx - 1] = EUR_STYLE
+
+    # All of a row's values in one C-level call; a row missing one of the
+    # keys raises KeyError and falls back to per-key .get()
+    pick = itemgetter(*keys) if end_col > 1 else (lambda row, key=keys[0]: (row[key],))
+
+    # ----- Pass 1: row count + column widths -----
+    # Widths must be known before the first row is written.
+    max_len = [len(str(cap)) for cap in captions]
+    data_rows = 0
+    for row in rows:
+        data_rows += 1
+        try:
+            vals = pick(row)
+        except KeyError:
+            vals = [row.get(key, "") for key in keys]
+        for i, val in enumerate(vals):
+            L = len(str(val))
+            if L > max_len[i]:
+                max_len[i] = L
+    end_row = header_row + data_rows
+
+    # Column widths (auto-ish)
+    for letter, width in zip(col_letters, max_len):
+        ws.column_dimensions[letter].width = width + 5
+
+    # ----- Freeze header row -----
+    ws.freeze_panes = "A6"  # row 5 fixed
 
     # ----- Row 1: merged yellow banner -----
-    ws.merge_cells(f"A1:{last_col_letter}1")
-    a1 = ws["A1"]
-    a1.value = date_time_user
-    a1.fill = PatternFill("solid", fgColor=YELLOW_BANNER)
-    a1.font = Font(bold=True)
-    a1.alignment = Alignment(horizontal="left", vertical="center")
+    ws.merged_cells.add(f"A1:{last_col_letter}1")
+    a1 = WriteOnlyCell(ws, value=date_time_user)
+    a1.fill = BANNER_FILL
+    a1.font = BOLD_FONT
+    a1.alignment = LEFT_ALIGN
     ws.row_dimensions[1].height = 22
+    ws.append([a1])
 
     # ----- Row 2: Title -----
-    ws.merge_cells(f"A2:{last_col_letter}2")
-    a2 = ws["A2"]
-    a2.value = caption
-    a2.font = Font(size=16, bold=True, color=TITLE_BLUE)
-    a2.alignment = Alignment(horizontal="left", vertical="center")
+    ws.merged_cells.add(f"A2:{last_col_letter}2")
+    a2 = WriteOnlyCell(ws, value=caption)
+    a2.font = TITLE_FONT
+    a2.alignment = LEFT_ALIGN
     ws.row_dimensions[2].height = 20
+    ws.append([a2])
 
     # ----- Row 3: Legend -----
-    ws.merge_cells(f"A3:{last_col_letter}3")
-    a3 = ws["A3"]
-    a3.value = legend_text
-    a3.font = Font(italic=True)
-    a3.alignment = Alignment(horizontal="left", vertical="center")
+    ws.merged_cells.add(f"A3:{last_col_letter}3")
+    a3 = WriteOnlyCell(ws, value=legend_text)
+    a3.font = LEGEND_FONT
+    a3.alignment = LEFT_ALIGN
+    ws.append([a3])
 
     # Row 4 is a spacer (as per screenshot look)
     ws.row_dimensions[4].height = 6
+    ws.append([])
 
     # ----- Row 5: Header band (light blue) -----
-    header_row = 5
-    for col_idx, header in enumerate(captions, start=1):
-        c = ws.cell(row=header_row, column=col_idx, value=header)
-        c.font = Font(bold=True, color=HEADER_FONT)
-        c.fill = PatternFill("solid", fgColor=HEADER_FILL)
-        c.alignment = Alignment(horizontal="center", vertical="center")
-        c.border = Border(top=thin, left=thin, right=thin, bottom=thin)
+    header_cells = []
+    for header in captions:
+        c = WriteOnlyCell(ws, value=header)
+        c.font = HEADER_FONT
+        c.fill = HEADER_FILL
+        c.alignment = CENTER_ALIGN
+        c.border = THIN_BORDER
+        header_cells.append(c)
     ws.row_dimensions[header_row].height = 20
-
-    # ----- Data rows -----
-    # Identify special columns
-    percent_col_idx = None
-    turnover_col_idx = None
-    for idx, cap in enumerate(captions, start=1):
-        if cap.strip() == "%":
-            percent_col_idx = idx
-        norm = cap.replace("\r", "").replace("\n", "").strip().lower()
-        if norm.startswith("turnover"):
-            turnover_col_idx = idx
-
-    start_row = header_row + 1
-    for r_idx, row in enumerate(rows, start=start_row):
-        for c_idx, key in enumerate(keys, start=1):
-            val = row.get(key, "")
-            if percent_col_idx is not None and c_idx == percent_col_idx:
-                try:
-                    if val not in (None, ""):
-                        val = float(val) / 100.0  # 6.4 -> 0.064
-                except Exception:
-                    pass
-            if turnover_col_idx is not None and c_idx == turnover_col_idx:
-                try:
-                    if val not in (None, ""):
-                        val = float(val)
-                except Exception:
-                    pass
-            cell = ws.cell(row=r_idx, column=c_idx, value=val)
-            cell.border = Border(left=thin, right=thin)
-
-    data_rows = len(rows)
-    end_row = header_row + data_rows
-
-    # Column widths (auto-ish)
-    for idx, col_def in enumerate(col_defs, start=1):
-        cap = col_def["caption"]; key = col_def["name"]
-        max_len_in_data = 0
+    ws.append(header_cells)
+
+    # ----- Pass 2: data rows -----
+    # Plain values are appended as-is; only the formatted columns need a cell.
+    # Those cells are styled once here and refilled for every row: a write-only
+    # sheet serialises each row inside append(), so the same cell objects can
+    # carry the next row's values. Each special column is converted and
+    # styled in the same step. An empty report skips the pass, which for a
+    # streamed upload saves re-parsing the file.
+    if data_rows:
+        template_cells = []
+        for i, (convert, style) in enumerate(zip(converters, cell_styles)):
+            if style:
+                cell = WriteOnlyCell(ws)
+                cell.style = style
+                template_cells.append((i, convert, cell))
         for row in rows:
-            max_len_in_data = max(max_len_in_data, len(str(row.get(key, ""))))
-        ws.column_dimensions[get_column_letter(idx)].width = max(len(str(cap)), max_len_in_data) + 5
-    
-    
-
-    # Number formats
-    if turnover_col_idx:
-        for r in range(start_row, end_row + 1):
-            ws.cell(row=r, column=turnover_col_idx).number_format = "#,##0.00"
-    if percent_col_idx:
-        for r in range(start_row, end_row + 1):
-            ws.cell(row=r, column=percent_col_idx).number_format = "0.0%"
+            try:
+                vals = list(pick(row))
+            except KeyError:
+                vals = [row.get(key, "") for key in keys]
+            for i, convert, cell in template_cells:
+                cell.value = convert(vals[i])
+                vals[i] = cell
+            ws.append(vals)
 
     # ----- AutoFilter (filters arrows like screenshot) -----
     if data_rows >= 0:
         ws.auto_filter.ref = f"A{header_row}:{last_col_letter}{max(end_row, header_row)}"
 
-    # ----- Freeze header row -----
-    ws.freeze_panes = ws["A6"]  # row 5 fixed
-
     # ----- Totals row (bold + thick top border) -----
-    total_row = end_row + 1 if data_rows >= 1 else header_row + 1
-    if turnover_col_idx:
+    # Only with data: with no rows it would land on row 6 and sum itself
+    if turnover_col_idx and data_rows:
+        total_cells = [WriteOnlyCell(ws) for _ in range(end_col)]
+        for cell in total_cells:
+            cell.border = TOTAL_BORDER
+
         # Label in column before turnover if available, else in A
         label_col = turnover_col_idx - 1 if turnover_col_idx > 1 else 1
-        ws.cell(row=total_row, column=label_col).value = "Total"
-        ws.cell(row=total_row, column=label_col).font = Font(bold=True)
+        total_cells[label_col - 1].value = "Total"
+        total_cells[label_col - 1].font = BOLD_FONT
 
         # Sum formulas
         first_data = start_row
-        last_data = end_row if data_rows >= 1 else start_row  # safe
-        sum_cell = ws.cell(row=total_row, column=turnover_col_idx)
-        sum_cell.value = f"=SUM({get_column_letter(turnover_col_idx)}{first_data}:{get_column_letter(turnover_col_idx)}{last_data})"
-        sum_cell.number_format = "#,##0.00"
-        sum_cell.font = Font(bold=True)
+        last_data = end_row
+        sum_cell = total_cells[turnover_col_idx - 1]
+        turnover_letter = col_letters[turnover_col_idx - 1]
+        sum_cell.value = f"=SUM({turnover_letter}{first_data}:{turnover_letter}{last_data})"
+        sum_cell.number_format = EUR_FMT
+        sum_cell.font = BOLD_FONT
 
         if percent_col_idx:
-            pct_sum_cell = ws.cell(row=total_row, column=percent_col_idx)
-            pct_sum_cell.value = f"=SUM({get_column_letter(percent_col_idx)}{first_data}:{get_column_letter(percent_col_idx)}{last_data})"
-            pct_sum_cell.number_format = "0.0%"
-            pct_sum_cell.font = Font(bold=True)
+            pct_sum_cell = total_cells[percent_col_idx - 1]
+            percent_letter = col_letters[percent_col_idx - 1]
+            pct_sum_cell.value = f"=SUM({percent_letter}{first_data}:{percent_letter}{last_data})"
+            pct_sum_cell.number_format = PCT_FMT
+            pct_sum_cell.font = BOLD_FONT
 
-        # Thick top border across full width
-        for c_idx in range(1, end_col + 1):
-            cell = ws.cell(row=total_row, column=c_idx)
-            cell.border = Border(top=thick, left=thin, right=thin, bottom=thin)
+        ws.append(total_cells)
 
     # ----- Logo (logo.png) near H2 (if present) -----
     try:
-        logo_path = resolve_logo_path()
-        if logo_path:
-            img = XLImage(str(logo_path))
-            # exact size ~ 2.9" x 0.42" at 96 DPI
-            img.width = 278  # px
-            img.height = 40  # px
+        logo_path, logo_bytes = get_logo()
+        if logo_bytes:
+            # fresh BytesIO per report: openpyxl reads the image data back at save time
+            img = XLImage(io.BytesIO(logo_bytes))  # already LOGO_SIZE
             ws.add_image(img, "H2")
             logger.info(f"Logo added from {logo_path}")
         else:
@@ -286,19 +496,101 @@ def build_workbook(payload: Dict[str, Any]) -> io.BytesIO:
     except Exception as e:
         logger.warning(f"Logo not added: {e}")
     # ----- Save & self-validate -----
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
+    if out is None:
+        out = io.BytesIO()
+    # What wb.save() does, but with an explicit deflate level. openpyxl always
+    # uses zlib's default (6), which takes about twice as long as level 1 for
+    # a roughly 15% smaller file.
+    archive = zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED, allowZip64=True,
+                              compresslevel=XLSX_COMPRESSLEVEL)
+    ExcelWriter(wb, archive).save()
+    out.seek(0)
     try:
-        _ = load_workbook(buf)  # validation
-        buf.seek(0)
+        # structural check only: reads the zip central directory, not the cells
+        with zipfile.ZipFile(out) as z:
+            if "xl/workbook.xml" not in z.namelist():
+                raise ValueError("xl/workbook.xml missing")
+        out.seek(0)
     except Exception as e:
         raise ValueError(f"Generated workbook failed validation: {e}")
 
-    return buf
+    return out
 
 
 # ---------------- Routes ----------------
+# With REPORT_PROCESSES > 0, report builds (CPU-bound Python) run in worker
+# processes, so concurrent reports build in parallel instead of taking turns
+# on the GIL. Off by default: every server worker would get its own pool.
+# Workers are spawned, not forked, because the server process runs threads.
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def report_pool(broken: ProcessPoolExecutor | None = None) -> ProcessPoolExecutor:
+    """
+    Return the report worker pool, creating it on first use. Passing the pool
+    that raised BrokenProcessPool replaces it: once a worker dies, the old
+    pool refuses every new job.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None or _executor is broken:
+            if broken is not None:
+                broken.shutdown(wait=False, cancel_futures=True)
+            _executor = ProcessPoolExecutor(
+                max_workers=REPORT_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_report_worker,
+                initargs=(get_logo(),),
+            )
+        return _executor
+
+
+def write_report(fp: BinaryIO, out_path: str) -> None:
+    """Parse the uploaded JSON in `fp` and save its workbook to `out_path`."""
+    payload = load_payload(fp)
+    with open(out_path, "w+b") as out:
+        build_workbook(payload, out)
+
+
+def write_report_file(in_path: str, out_path: str) -> None:
+    """Worker process entry point: write_report for the JSON file at `in_path`."""
+    with open(in_path, "rb") as fp:
+        write_report(fp, out_path)
+
+
+def copy_upload(src: BinaryIO, path: str) -> None:
+    """Copy the spooled upload to `path`, which a worker process can open."""
+    src.seek(0)
+    with open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1 << 16)
+
+
+async def run_report(upload: BinaryIO, out_path: str) -> None:
+    """Build the report for `upload` into `out_path` without blocking the event loop."""
+    if REPORT_PROCESSES <= 0:
+        await asyncio.to_thread(write_report, upload, out_path)
+        return
+    # The spooled upload can't be handed to another process, so pass it as a file
+    fd, in_path = tempfile.mkstemp(prefix="turnover-upload-", suffix=".json")
+    os.close(fd)
+    try:
+        await asyncio.to_thread(copy_upload, upload, in_path)
+        await asyncio.to_thread(get_logo)  # first call may download; keep it off the loop
+        loop = asyncio.get_running_loop()
+        pool = report_pool()
+        try:
+            await loop.run_in_executor(pool, write_report_file, in_path, out_path)
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash in a C extension): start a fresh
+            # pool and retry this report once
+            logger.warning("/report worker pool broken; restarting it")
+            pool = report_pool(broken=pool)
+            await loop.run_in_executor(pool, write_report_file, in_path, out_path)
+    finally:
+        os.unlink(in_path)
+
+
 @app.post(
     "/report",
     summary="Upload turnover JSON and receive styled Excel file",
@@ -306,6 +598,7 @@ def build_workbook(payload: Dict[str, Any]) -> io.BytesIO:
     responses={
        200: {"content": {"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {}}},
        400: {"description": "Bad Request"},
+       413: {"description": "Payload Too Large"},
        500: {"description": "Server Error"},
     },
     openapi_extra={
@@ -331,25 +624,38 @@ async def create_report(file: UploadFile = File(..., description="Upload a `turn
         raise HTTPException(status_code=400, detail="Please upload a JSON file.")
     logger.info(f"/report upload: filename={file.filename} content_type={file.content_type}")
 
+    # The workbook is saved to a temp file that is streamed back and removed
+    # once sent, so the finished report never sits in memory either
+    fd, out_path = tempfile.mkstemp(prefix="turnover-report-", suffix=".xlsx")
+    os.close(fd)
     try:
-        raw = await file.read()
-        payload = json.loads(raw.decode("utf-8"))
-        xlsx_bytes = build_workbook(payload)
+        try:
+            # The multipart parser has already spooled the upload to a temp file;
+            # parsing and openpyxl work are synchronous, so keep them off the event loop
+            await run_report(file.file, out_path)
+        except BaseException:
+            os.unlink(out_path)
+            raise
+    except (orjson.JSONDecodeError, ijson.JSONError):
+        logger.warning("/report invalid JSON")
+        raise HTTPException(status_code=400, detail="Invalid JSON.")
     except ValueError as ve:
         logger.warning(f"/report bad request: {ve}")
         raise HTTPException(status_code=400, detail=str(ve))
-    except json.JSONDecodeError:
-        logger.warning("/report invalid JSON")
-        raise HTTPException(status_code=400, detail="Invalid JSON.")
     except Exception as ex:
         logger.exception(f"/report failed: {ex}")
         raise HTTPException(status_code=500, detail=f"Failed to generate report: {ex}")
 
-    headers = {"Content-Disposition": 'attachment; filename="turnover-report.xlsx"'}
-    return StreamingResponse(
-        xlsx_bytes,
+    headers = {
+        "Content-Disposition": 'attachment; filename="turnover-report.xlsx"',
+        # .xlsx is already a deflated zip; mark it so nothing re-compresses it
+        "Content-Encoding": "identity",
+    }
+    return FileResponse(
+        out_path,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers=headers,
+        background=BackgroundTask(os.unlink, out_path),
     )
 
 @app.get("/", include_in_schema=False)